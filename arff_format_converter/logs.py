@@ -1,16 +1,23 @@
 import sys
+from collections import deque
 
 FILE_ERROR = 0
 OPTION_ERROR = 1
 OTHER_ERROR = 2
-legal_formats = ["xml", "json", "csv", "xlsx", "orc", "parquet"]
-error_array = ["Invalid file extension - expects '<filename>.arff'",
-               "Invalid option - expects 'xml', 'json', 'csv', 'xlsx', 'orc' or 'parquet'.", "The file format is invalid."]
-error_log = []
+legal_formats = frozenset(
+    {"xml", "json", "csv", "xlsx", "orc", "parquet", "arrow", "feather"})
+# Built once from legal_formats so the message cannot drift from the set.
+legal_formats_msg = ", ".join(f"'{fmt}'" for fmt in sorted(legal_formats))
+error_array = ("Invalid file extension - expects '<filename>.arff'",
+               f"Invalid option - expects one of {legal_formats_msg}.", "The file format is invalid.")
+# Only the most recent errors are kept, so long batch runs do not grow it.
+error_log = deque(maxlen=1024)
 
 
 def console(msg: object):
-    print(msg, file=sys.stderr)
+    # sys.stderr is looked up per call rather than bound at import, so
+    # redirect_stderr and test capture still see the output.
+    sys.stderr.write(f"{msg}\n")
 
 
 def log_error(line_num, error_index, details):
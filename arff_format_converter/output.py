@@ -1,58 +1,364 @@
 import pyarrow as pa
-import pandas as pd
-from .logs import exit_with_errors
+from .logs import log_error, exit_with_errors, OTHER_ERROR
+from .reader import ArffStreamError
 import itertools
+import os
 import threading
-import time
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 
-import pyarrow.orc as orc
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 
+# Writer-specific dependencies (orjson, xlsxwriter, pyarrow.orc,
+# pyarrow.parquet, pyarrow.feather) are imported inside the writer that
+# needs them.
 
-def build_output(df: pd.DataFrame, output_file: str, output_format: str, fast: bool = False):
+CHUNK_SIZE = 10000
+PARQUET_ROW_GROUP_SIZE = 65536
+# An XLSX sheet holds 1,048,576 rows, one of which is the header.
+XLSX_MAX_DATA_ROWS = 1048575
+# "&" must be replaced first so the other entities are not escaped twice.
+XML_ENTITIES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"))
+
+
+def _batches(data, max_chunksize: int):
+    # A RecordBatchReader yields whole CSV blocks, so its batches are
+    # sliced (zero-copy) to max_chunksize rows as well.
+    if isinstance(data, pa.Table):
+        yield from data.to_batches(max_chunksize=max_chunksize)
+        return
+    for batch in data:
+        for offset in range(0, batch.num_rows, max_chunksize):
+            yield batch.slice(offset, max_chunksize)
+
+
+def _pieces(data):
+    # Writers that accept both tables and batches take a Table whole.
+    return [data] if isinstance(data, pa.Table) else data
+
+
+def _read_all(data) -> pa.Table:
+    return data if isinstance(data, pa.Table) else data.read_all()
+
+
+def _decode_dictionaries(table: pa.Table) -> pa.Table:
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(
+                i, field.name, pc.cast(table.column(i), field.type.value_type))
+    return table
+
+
+def _xml_columns(batch: pa.RecordBatch) -> list:
+    columns = []
+    for name, column in zip(batch.schema.names, batch.columns):
+        text = pc.cast(column, pa.string())
+        for char, entity in XML_ENTITIES:
+            text = pc.replace_substring(text, char, entity)
+        element = pc.binary_join_element_wise(
+            f"    <{name}>", text, f"</{name}>\n", "")
+        columns.append(pc.fill_null(element, f"    <{name}/>\n").to_pylist())
+    return columns
+
+
+def write_xml(data, output_file: str):
+    """
+    Writes an Arrow table or batch stream as XML, one <row> element per record.
+
+    Values are cast, escaped and wrapped in their element tags column by
+    column with Arrow compute kernels, and rows are streamed to the file in
+    batches of CHUNK_SIZE so that only one batch of element strings is held
+    in memory at a time.
+
+    Args:
+        data (pa.Table | pa.RecordBatchReader): The input data to convert.
+        output_file (str): The path to the output file.
+    """
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n<data>\n")
+        for batch in _batches(data, CHUNK_SIZE):
+            f.writelines(itertools.chain.from_iterable(
+                ("  <row>\n", *row, "  </row>\n") for row in zip(*_xml_columns(batch))))
+        f.write("</data>")
+
+
+def _parallel_chunk_size(table: pa.Table) -> int:
+    return max(CHUNK_SIZE, table.num_rows // (os.cpu_count() or 1))
+
+
+def _json_chunk(batch: pa.RecordBatch) -> bytes:
+    import orjson
+
+    # Strip the enclosing brackets so chunks join into one array.
+    return orjson.dumps(batch.to_pylist())[1:-1]
+
+
+def _write_joined(f, chunks):
+    separator = b""
+    for chunk in chunks:
+        f.write(separator)
+        f.write(chunk)
+        separator = b","
+
+
+def write_json(data, output_file: str, fast: bool = False):
     """
-    Converts a pandas DataFrame to various file formats and writes to the specified output file.
+    Writes an Arrow table or batch stream as a JSON array of records using orjson.
+
+    Records are encoded one batch at a time and appended to the file, so
+    only one batch of Python objects exists at once. In fast mode the data
+    is loaded in full, split into one chunk per CPU and the chunks are
+    encoded in worker processes, then written in order.
 
     Args:
-        df (pd.DataFrame): The input DataFrame to convert.
+        data (pa.Table | pa.RecordBatchReader): The input data to convert.
         output_file (str): The path to the output file.
-        output_format (str): The desired output file format (xml, json, csv, xlsx, orc, parquet).
+        fast (bool): Encode chunks in parallel.
     """
-    done = False
+    with open(output_file, "wb") as f:
+        f.write(b"[")
+        if fast:
+            table = _read_all(data)
+            batches = [batch for batch in table.to_batches(
+                max_chunksize=_parallel_chunk_size(table)) if batch.num_rows]
+            with ProcessPoolExecutor() as executor:
+                _write_joined(f, executor.map(_json_chunk, batches))
+        else:
+            batches = (batch for batch in _batches(data, CHUNK_SIZE) if batch.num_rows)
+            _write_joined(f, map(_json_chunk, batches))
+        f.write(b"]")
+
+
+def _csv_chunk(data, include_header: bool = False) -> pa.Buffer:
+    sink = pa.BufferOutputStream()
+    pv.write_csv(data, sink, pv.WriteOptions(include_header=include_header))
+    return sink.getvalue()
+
+
+def write_csv(data, output_file: str, fast: bool = False):
+    """
+    Writes an Arrow table or batch stream as CSV with the pyarrow CSV writer.
+
+    In fast mode the data is loaded in full, split into one chunk per CPU
+    and the chunks are encoded on a thread pool (the Arrow writer releases
+    the GIL), then written in order.
+
+    Args:
+        data (pa.Table | pa.RecordBatchReader): The input data to convert.
+        output_file (str): The path to the output file.
+        fast (bool): Encode chunks in parallel.
+    """
+    if not fast:
+        with pv.CSVWriter(output_file, data.schema) as writer:
+            for piece in _pieces(data):
+                writer.write(piece)
+        return
+
+    table = _read_all(data)
+    with open(output_file, "wb") as f:
+        f.write(_csv_chunk(table.schema.empty_table(), include_header=True))
+        batches = table.to_batches(max_chunksize=_parallel_chunk_size(table))
+        with ThreadPoolExecutor() as executor:
+            for chunk in executor.map(_csv_chunk, batches):
+                f.write(chunk)
+
+
+def write_xlsx(data, output_file: str):
+    """
+    Writes an Arrow table or batch stream as XLSX using xlsxwriter in constant-memory mode.
+
+    Each row is flushed to disk as soon as it is written, so the writer
+    keeps no per-cell objects in memory. Data with more rows than a sheet
+    holds is reported as an error rather than truncated.
+
+    Args:
+        data (pa.Table | pa.RecordBatchReader): The input data to convert.
+        output_file (str): The path to the output file.
+    """
+    from xlsxwriter import Workbook
+
+    too_many_rows = (f"XLSX holds at most {XLSX_MAX_DATA_ROWS:,} data rows; "
+                     "choose another output format for this file.")
+    if isinstance(data, pa.Table) and data.num_rows > XLSX_MAX_DATA_ROWS:
+        log_error(0, OTHER_ERROR, too_many_rows)
+        exit_with_errors()
+
+    # ARFF strings are data: never turn '=1+1' into a formula or URL-like
+    # values into (per-sheet capped) hyperlinks.
+    with Workbook(output_file, {"constant_memory": True,
+                                "nan_inf_to_errors": True,
+                                "strings_to_formulas": False,
+                                "strings_to_urls": False,
+                                "default_date_format": "yyyy-mm-dd hh:mm:ss"}) as workbook:
+        sheet = workbook.add_worksheet("Data")
+        sheet.write_row(0, 0, data.schema.names)
+        row_num = 1
+        for batch in _batches(data, CHUNK_SIZE):
+            for row in zip(*(column.to_pylist() for column in batch.columns)):
+                # xlsxwriter returns -1 and writes nothing past the last row;
+                # a stream's length is only known here.
+                if sheet.write_row(row_num, 0, row) == -1:
+                    log_error(0, OTHER_ERROR, too_many_rows)
+                    exit_with_errors()
+                row_num += 1
+
+
+def write_orc(data, output_file: str, compression: str):
+    """
+    Writes an Arrow table or batch stream as ORC.
+
+    For a table, the stripe size is sized to hold roughly CHUNK_SIZE rows,
+    clamped to 8-64 MiB, which bounds writer memory on wide tables; a
+    stream uses the 64 MiB upper bound. Nominal (dictionary) columns are
+    written as plain strings, which ORC dictionary-encodes itself.
+
+    Args:
+        data (pa.Table | pa.RecordBatchReader): The input data to convert.
+        output_file (str): The path to the output file.
+        compression (str): The ORC compression codec.
+    """
+    import pyarrow.orc as orc
+
+    stripe_size = 64 << 20
+    if isinstance(data, pa.Table):
+        row_bytes = data.nbytes // max(data.num_rows, 1)
+        stripe_size = min(stripe_size, max(8 << 20, CHUNK_SIZE * row_bytes))
+
+    with orc.ORCWriter(output_file,
+                       compression=("uncompressed" if compression == "none" else compression),
+                       compression_block_size=65536, stripe_size=stripe_size) as writer:
+        for piece in _pieces(data):
+            if not isinstance(piece, pa.Table):
+                piece = pa.Table.from_batches([piece])
+            writer.write(_decode_dictionaries(piece))
+
+
+def write_parquet(data, output_file: str, compression: str, fast: bool = False):
+    """
+    Writes an Arrow table or batch stream as Parquet.
+
+    zstd is written at level 1, which keeps write speed close to snappy while
+    producing noticeably smaller files; pass 'lz4' for the fastest codec.
+    Integer columns use DELTA_BINARY_PACKED and float columns
+    BYTE_STREAM_SPLIT; all other columns keep dictionary encoding. Row
+    groups hold at most PARQUET_ROW_GROUP_SIZE rows.
+
+    Args:
+        data (pa.Table | pa.RecordBatchReader): The input data to convert.
+        output_file (str): The path to the output file.
+        compression (str): The Parquet compression codec.
+        fast (bool): Skip writing column statistics.
+    """
+    import pyarrow.parquet as pq
+
+    column_encoding = {}
+    for field in data.schema:
+        if pa.types.is_integer(field.type):
+            column_encoding[field.name] = "DELTA_BINARY_PACKED"
+        elif pa.types.is_floating(field.type):
+            column_encoding[field.name] = "BYTE_STREAM_SPLIT"
+    dictionary_columns = [name for name in data.schema.names
+                          if name not in column_encoding]
+
+    with pq.ParquetWriter(output_file, data.schema, compression=compression,
+                          compression_level=(1 if compression == "zstd" else None),
+                          use_dictionary=dictionary_columns,
+                          column_encoding=(column_encoding or None),
+                          data_page_version="2.0",
+                          write_statistics=not fast) as writer:
+        for piece in _pieces(data):
+            writer.write(piece, row_group_size=PARQUET_ROW_GROUP_SIZE)
+
+
+def write_feather(data, output_file: str, compression: str):
+    """
+    Writes an Arrow table or batch stream as Feather (Arrow IPC file format).
+
+    A stream is loaded in full first: the IPC file format needs one
+    dictionary per nominal column, so the per-batch dictionaries produced
+    by the CSV reader are unified before writing.
+
+    Args:
+        data (pa.Table | pa.RecordBatchReader): The input data to convert.
+        output_file (str): The path to the output file.
+        compression (str): The Feather compression codec ('lz4', 'zstd' or 'uncompressed').
+    """
+    import pyarrow.feather as feather
+
+    feather.write_feather(_read_all(data).unify_dictionaries(), output_file,
+                          compression=compression)
+
+
+@contextmanager
+def spinner():
+    """
+    Shows a 'Converting' spinner on stdout while the block runs.
+
+    Nothing is drawn when stdout is not a terminal (pipes, CI logs).
+    """
+    if not sys.stdout.isatty():
+        yield
+        return
+
+    done = threading.Event()
 
     def animate():
         for c in itertools.cycle(['|', '/', '-', '\\']):
-            if done:
-                break
             sys.stdout.write('\rConverting ' + c)
             sys.stdout.flush()
-            time.sleep(0.1)
+            if done.wait(0.1):
+                break
 
     t = threading.Thread(target=animate)
     t.start()
 
-    def stop_animation():
-        nonlocal done
-        done = True
+    try:
+        yield
+    finally:
+        done.set()
         t.join()
 
+
+def build_output(table, output_file: str, output_format: str, fast: bool = False, compression: str = None):
+    """
+    Converts an Arrow table or batch stream to various file formats and writes to the specified output file.
+
+    A stream that hits a parse error part-way through raises
+    ArffStreamError so the caller can reload the file and try again.
+
+    Args:
+        table (pa.Table | pa.RecordBatchReader): The input data to convert.
+        output_file (str): The path to the output file.
+        output_format (str): The desired output file format (xml, json, csv, xlsx, orc, parquet, arrow, feather).
+        fast (bool): Prefer faster codecs over smaller output.
+        compression (str): The Parquet/ORC compression codec ('zstd', 'snappy', 'lz4' or 'none'). Defaults to 'snappy' in fast mode and 'zstd' otherwise.
+    """
+    codec = compression or ("snappy" if fast else "zstd")
+
     try:
-        output_functions = {
-            "xml": lambda: df.to_xml(output_file, parser="etree", index=False, compression=("infer" if fast else None)),
-            "json": lambda: df.to_json(output_file, orient="records", index=False, compression=("infer" if fast else None)),
-            "csv": lambda: df.to_csv(output_file, index=False, chunksize=(1000 if fast else None)),
-            "xlsx": lambda: df.to_excel(output_file, index=False, chunksize=(1000 if fast else None)),
-            "orc": lambda: orc.write_table(pa.Table.from_pandas(df, preserve_index=False), output_file, compression=("snappy" if fast else None)),
-            "parquet": lambda: df.to_parquet(output_file, index=False, compression=("snappy" if fast else None))
-        }
-
-        if output_format in output_functions:
-            output_functions[output_format]()
+        # Called directly rather than through a dict of lambdas rebuilt on
+        # every call.
+        if output_format == "parquet":
+            write_parquet(table, output_file, codec, fast)
+        elif output_format == "orc":
+            write_orc(table, output_file, codec)
+        elif output_format == "csv":
+            write_csv(table, output_file, fast)
+        elif output_format == "json":
+            write_json(table, output_file, fast)
+        elif output_format == "xml":
+            write_xml(table, output_file)
+        elif output_format == "xlsx":
+            write_xlsx(table, output_file)
+        elif output_format in ("arrow", "feather"):
+            write_feather(table, output_file, "lz4" if fast else "zstd")
         else:
             print("Invalid output format. Please provide a valid output format.")
             exit_with_errors()
+    except ArffStreamError:
+        raise
     except Exception as e:
         print(f"{output_format.upper()}: ", e)
         exit_with_errors()
-    finally:
-        stop_animation()
@@ -0,0 +1,296 @@
+import codecs
+import csv
+import io
+import os
+import re
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+from .logs import log_error, exit_with_errors, FILE_ERROR, OTHER_ERROR
+
+# numpy is only needed on the numeric fallback path, so it is imported
+# where it is used.
+
+ATTRIBUTE_RE = re.compile(
+    r"@attribute\s+('[^']*'|\"[^\"]*\"|\S+)\s+(.+)", re.IGNORECASE)
+NUMERIC_TYPES = {"numeric": pa.float64(),
+                 "real": pa.float64(), "integer": pa.int64()}
+# Read buffer for the Python-side fallback parsers; the default 8 KiB
+# buffer means thousands of read() calls on large files.
+READ_BUFFER_SIZE = 1 << 20
+# Bytes inspected by sniff_encoding.
+SNIFF_SIZE = 1 << 16
+# Block size for the Arrow CSV reader; larger blocks give its worker
+# threads more rows to parse per task than the 1 MiB default.
+CSV_BLOCK_SIZE = 1 << 22
+
+
+def _unquote(token: str) -> str:
+    token = token.strip()
+    if len(token) > 1 and token[0] == token[-1] and token[0] in "'\"":
+        return token[1:-1]
+    return token
+
+
+def _arrow_type(spec: str) -> pa.DataType:
+    spec = spec.strip()
+    if spec.startswith("{"):
+        return pa.dictionary(pa.int32(), pa.string())
+
+    kind, _, fmt = spec.partition(" ")
+    kind = kind.lower()
+    if kind in NUMERIC_TYPES:
+        return NUMERIC_TYPES[kind]
+    if kind == "date" and not fmt.strip():
+        # The default ARFF date format is ISO-8601, which Arrow parses natively.
+        return pa.timestamp("s")
+    return pa.string()
+
+
+def sniff_encoding(f) -> str:
+    """
+    Guesses the text encoding of a binary file object from its first SNIFF_SIZE bytes.
+
+    The file is rewound afterwards.
+
+    Args:
+        f: A file object opened in binary mode.
+
+    Returns:
+        str: 'utf-8' if the sample decodes as UTF-8, 'latin-1' otherwise.
+    """
+    sample = f.read(SNIFF_SIZE)
+    f.seek(0)
+    try:
+        # An incremental decoder tolerates a character cut off at the end.
+        codecs.getincrementaldecoder("utf-8")().decode(sample)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def read_header(f, encoding: str = "utf-8"):
+    """
+    Reads the ARFF header from a binary file object, leaving it positioned at the first data line.
+
+    Args:
+        f: A file object opened in binary mode.
+        encoding (str): The text encoding of the file.
+
+    Returns:
+        tuple: The attribute names and their Arrow types.
+    """
+    names, types = [], []
+    for raw in f:
+        line = raw.decode(encoding).strip()
+        if not line or line.startswith("%"):
+            continue
+        if line.lower().startswith("@data"):
+            return names, types
+        match = ATTRIBUTE_RE.match(line)
+        if match:
+            names.append(_unquote(match.group(1)))
+            types.append(_arrow_type(match.group(2)))
+    raise ValueError("Missing @data section.")
+
+
+def _load_arff_numeric(filename: str, data_offset: int, names: list, types: list, encoding: str) -> pa.Table:
+    import numpy as np
+
+    # numpy's C tokenizer tolerates the padding and comment lines that the
+    # CSV reader rejects, but not missing values.
+    with open(filename, "rb", buffering=READ_BUFFER_SIZE) as f:
+        f.seek(data_offset)
+        values = np.loadtxt(f, delimiter=",", comments="%",
+                            ndmin=2, unpack=True, encoding=encoding)
+    if len(values) != len(names):
+        raise ValueError(
+            f"Expected {len(names)} values per row, got {len(values)}.")
+
+    return pa.table([pa.array(column).cast(arrow_type)
+                     for column, arrow_type in zip(values, types)], names=names)
+
+
+def _data_lines(f):
+    for line in f:
+        line = line.strip()
+        if line and not line.startswith("%"):
+            yield line
+
+
+def _load_arff_columns(filename: str, data_offset: int, names: list, types: list, encoding: str) -> pa.Table:
+    # Values are appended straight into one buffer per attribute, so the
+    # table is built column by column without a list of rows in between.
+    # Type conversion is left to Arrow casts over each whole column.
+    buffers = [[] for _ in names]
+    with open(filename, "rb", buffering=READ_BUFFER_SIZE) as raw:
+        raw.seek(data_offset)
+        with io.TextIOWrapper(raw, encoding=encoding, newline="") as f:
+            for row in csv.reader(_data_lines(f), quotechar="'", skipinitialspace=True):
+                if len(row) != len(buffers):
+                    raise ValueError(
+                        f"Expected {len(buffers)} values per row, got {len(row)}: {row}")
+                for buffer, value in zip(buffers, row):
+                    buffer.append(value)
+
+    # Trimming and missing-value detection run once per column in Arrow
+    # rather than once per cell in Python.
+    missing = pa.scalar(None, pa.string())
+    columns = []
+    for buffer, arrow_type in zip(buffers, types):
+        column = pc.utf8_trim_whitespace(pa.array(buffer, pa.string()))
+        column = pc.if_else(pc.equal(column, "?"), missing, column)
+        if pa.types.is_dictionary(arrow_type):
+            column = column.dictionary_encode()
+        elif arrow_type != pa.string():
+            column = column.cast(arrow_type)
+        columns.append(column)
+
+    return pa.table(columns, names=names)
+
+
+def _load_arff_fallback(filename: str, data_offset: int, names: list, types: list, encoding: str) -> pa.Table:
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        try:
+            return _load_arff_numeric(filename, data_offset, names, types, encoding)
+        except ValueError:
+            pass
+
+    try:
+        return _load_arff_columns(filename, data_offset, names, types, encoding)
+    except ValueError as e:
+        log_error(0, OTHER_ERROR, e)
+        exit_with_errors()
+
+
+class ArffStreamError(Exception):
+    """Raised when a streamed @data section turns out to need a fallback parser."""
+
+
+def _read_arff_header(filename: str):
+    try:
+        with open(filename, "rb") as f:
+            encoding = sniff_encoding(f)
+            names, types = read_header(f, encoding)
+            return encoding, names, types, f.tell()
+    except OSError as e:
+        # Missing, unreadable or not a regular file.
+        log_error(0, FILE_ERROR,
+                  f"Invalid file path. Please provide a valid path to the ARFF file. ({e.strerror}: {filename})")
+        exit_with_errors()
+    except ValueError as e:
+        # Covers UnicodeDecodeError as well.
+        log_error(0, OTHER_ERROR, e)
+        exit_with_errors()
+
+
+def _is_padded(data) -> bool:
+    # The Arrow CSV reader keeps the whitespace ARFF allows after a comma,
+    # so " 'x y'" stays quoted and " ?" is not read as missing. Such files
+    # are left to the csv-module parser, which also splits "1, 'a, b'"
+    # correctly. Dictionary columns are checked through their dictionary.
+    for column in data.columns:
+        chunks = column.chunks if isinstance(column, pa.ChunkedArray) else [column]
+        for chunk in chunks:
+            if pa.types.is_dictionary(chunk.type):
+                chunk = chunk.dictionary
+            elif not pa.types.is_string(chunk.type):
+                continue
+            if pc.any(pc.match_substring_regex(chunk, r"^\s|\s$")).as_py():
+                return True
+    return False
+
+
+def _csv_options(names: list, types: list, encoding: str) -> dict:
+    return dict(
+        read_options=pv.ReadOptions(
+            column_names=names, block_size=CSV_BLOCK_SIZE, use_threads=True,
+            encoding=encoding),
+        parse_options=pv.ParseOptions(quote_char="'"),
+        convert_options=pv.ConvertOptions(
+            column_types=dict(zip(names, types)),
+            null_values=["?"],
+            strings_can_be_null=True))
+
+
+def load_arff(filename: str) -> pa.Table:
+    """
+    Loads an ARFF file into a pyarrow Table.
+
+    Only the header is parsed in Python; the memory-mapped @data section
+    is handed to the pyarrow CSV reader with a schema derived from the
+    attributes. Files the CSV reader cannot handle (comments or padding
+    inside the data section) are read with numpy.loadtxt when every
+    attribute is numeric, and with a csv-module parser otherwise; the
+    csv-module parser also handles string values padded with whitespace.
+    Sparse data rows are not supported.
+
+    Args:
+        filename (str): The path to the ARFF file.
+
+    Returns:
+        pa.Table: The loaded data.
+    """
+    # pa.memory_map only takes str paths.
+    filename = os.fsdecode(filename)
+    encoding, names, types, data_offset = _read_arff_header(filename)
+
+    try:
+        # The data section is read from a memory map, so Arrow parses the
+        # page cache directly instead of copying through Python reads.
+        with pa.memory_map(filename) as source:
+            source.seek(data_offset)
+            table = pv.read_csv(source, **_csv_options(names, types, encoding))
+    except pa.ArrowInvalid:
+        return _load_arff_fallback(filename, data_offset, names, types, encoding)
+
+    if _is_padded(table):
+        return _load_arff_fallback(filename, data_offset, names, types, encoding)
+
+    return table
+
+
+def _guarded_batches(reader, source):
+    try:
+        for batch in reader:
+            if _is_padded(batch):
+                raise ArffStreamError("Padded values in the @data section.")
+            yield batch
+    except pa.ArrowInvalid as e:
+        raise ArffStreamError(e) from e
+    finally:
+        source.close()
+
+
+def stream_arff(filename: str):
+    """
+    Opens an ARFF file for streaming, one CSV_BLOCK_SIZE block of rows at a time.
+
+    The memory-mapped @data section is parsed lazily by the pyarrow
+    streaming CSV reader as the batches are consumed, so memory use does
+    not grow with the file size. A parse error, or values padded with
+    whitespace, in any block is raised as ArffStreamError; the caller
+    should then fall back to load_arff.
+
+    Args:
+        filename (str): The path to the ARFF file.
+
+    Returns:
+        pa.RecordBatchReader | pa.Table: A batch reader, or the fully loaded
+        table when the first block already needs a fallback parser.
+    """
+    # pa.memory_map only takes str paths.
+    filename = os.fsdecode(filename)
+    encoding, names, types, data_offset = _read_arff_header(filename)
+
+    source = pa.memory_map(filename)
+    source.seek(data_offset)
+    try:
+        reader = pv.open_csv(source, **_csv_options(names, types, encoding))
+    except pa.ArrowInvalid:
+        source.close()
+        return _load_arff_fallback(filename, data_offset, names, types, encoding)
+
+    return pa.RecordBatchReader.from_batches(reader.schema, _guarded_batches(reader, source))
@@ -5,6 +5,8 @@ bottom_msg = '''SUPPORTED FORMATS:
     - CSV (output)
     - XLSX (output)
     - ORC (Apache ORC format) (output)
+    - Parquet (output)
+    - Arrow / Feather (Arrow IPC format) (output)
 
 AUTHOR:
     Written by Shani Sinojiya <https://www.shanisinojiya.tech>.
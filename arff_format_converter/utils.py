@@ -2,36 +2,134 @@ import os
 import argparse
 from .validate import *
 from .texts import *
-from .output import *
 from .__init__ import __version__
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
-from scipy.io import arff
-import pandas as pd
 
+def load(filename: str):
+    """
+    Validates and loads an ARFF file.
 
-def process(filename: str, output_folder: str, output_format: str, fast: bool = False):
+    Args:
+        filename (str): Path to the ARFF file.
+
+    Returns:
+        pa.Table: The loaded data.
+    """
     validate_file_path(filename)
+
+    # Imported here so that --help and --version do not pay for pyarrow.
+    from .reader import load_arff
+
+    return load_arff(filename)
+
+
+def stream(filename: str):
+    """
+    Validates an ARFF file and opens it for streaming.
+
+    Args:
+        filename (str): Path to the ARFF file.
+
+    Returns:
+        pa.RecordBatchReader | pa.Table: See reader.stream_arff.
+    """
+    validate_file_path(filename)
+
+    from .reader import stream_arff
+
+    return stream_arff(filename)
+
+
+def write(data, output_folder: str, output_format: str, name: str, fast: bool = False, compression: str = None) -> str:
+    """
+    Writes loaded or streamed data to '<output_folder>/<name>.<output_format>'.
+
+    Args:
+        data (pa.Table | pa.RecordBatchReader): The data returned by load() or stream().
+        output_folder (str): Path to the output folder.
+        output_format (str): The desired output file format.
+        name (str): The output file name, without extension.
+        fast (bool): Enable fast mode.
+        compression (str): Parquet/ORC compression codec; see build_output.
+
+    Returns:
+        str: The path of the written file.
+    """
+    output_format = output_format.casefold()
     validate_output_folder(output_folder)
     validate_output_format(output_format)
 
-    data, _ = arff.loadarff(filename)
+    return _write(data, output_folder, output_format, name, fast, compression)
 
-    df = pd.DataFrame(data)
 
-    for column in df.columns:
-        if df[column].dtype == object:
-            df[column] = df[column].apply(lambda x: x.decode(
-                'utf-8') if isinstance(x, bytes) else x)
+def _write(data, output_folder: str, output_format: str, name: str, fast: bool = False, compression: str = None) -> str:
+    # write() without the checks, for callers that already validated the
+    # folder and format once (see process).
+    from .output import build_output
+
+    output_path = os.path.join(output_folder, f"{name}.{output_format}")
+    # Streamed output is written while the input is still being parsed, so
+    # it goes to a temporary name and is only renamed once complete; a
+    # failed conversion (including exit_with_errors) leaves nothing behind.
+    partial_path = f"{output_path}.part"
+    try:
+        build_output(data, partial_path, output_format, fast, compression)
+    except BaseException:
+        try:
+            os.remove(partial_path)
+        except FileNotFoundError:
+            pass
+        raise
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def process(filename: str, output_folder: str, output_formats: list, fast: bool = False, compression: str = None):
+    output_formats = [output_format.casefold() for output_format in output_formats]
+    validate_output_folder(output_folder)
+    for output_format in output_formats:
+        validate_output_format(output_format)
 
-    output_path = os.path.join(output_folder, f"{os.path.splitext(
-        os.path.basename(filename))[0]}_{int(time.time())}.{output_format}")
+    # Nanosecond suffix: two conversions in the same second no longer
+    # overwrite each other.
+    name = f"{os.path.splitext(os.path.basename(filename))[0]}_{time.time_ns()}"
 
-    build_output(df, output_folder, output_path, output_format, fast)
+    def write_all(data):
+        def timed_write(output_format):
+            start = time.perf_counter()
+            output_path = _write(data, output_folder,
+                                 output_format, name, fast, compression)
+            return output_path, time.perf_counter() - start
+
+        # The Arrow writers release the GIL, so the formats are written concurrently.
+        with ThreadPoolExecutor(max_workers=len(output_formats)) as executor:
+            return list(executor.map(timed_write, output_formats))
+
+    from .output import spinner
+    from .reader import ArffStreamError
+
+    with spinner():
+        # A single format is written batch by batch while the file is
+        # parsed; several formats are written from one table parsed once.
+        if len(output_formats) == 1:
+            try:
+                results = write_all(stream(filename))
+            except ArffStreamError:
+                # Part of the data section needs a fallback parser.
+                results = write_all(load(filename))
+        else:
+            results = write_all(load(filename))
 
-    # Greet and show path
-    print(f"File converted successfully to {output_format.upper()} format.")
-    print(f"Output file: {output_path}")
+    print("")
+    for output_format, (output_path, elapsed) in zip(output_formats, results):
+        print(
+            f"File converted successfully to {output_format.upper()} format in {elapsed:.3f}s.")
+        print(f"Output file: {output_path}")
+
+
+def greet():
     print("")
     print("Thank you for using ARFF Format Converter.")
     print("Please consider leaving a star on the GitHub repository.")
@@ -41,24 +139,91 @@ def process(filename: str, output_folder: str, output_format: str, fast: bool =
     print("")
 
 
+def expand_inputs(paths: list) -> list:
+    """
+    Replaces each folder in paths with the .arff files directly inside it.
+
+    Args:
+        paths (list): Paths to ARFF files or to folders of ARFF files.
+
+    Returns:
+        list: Paths to the ARFF files.
+    """
+    filenames = []
+    for path in paths:
+        try:
+            filenames.extend(sorted(validate_input_dir(path)))
+        except OSError:
+            # Not a folder; validate_file_path reports it if it is not a file either.
+            filenames.append(path)
+    return filenames
+
+
+def process_files(filenames: list, output_folder: str, output_formats: list, fast: bool = False, compression: str = None):
+    """
+    Converts several ARFF files, one worker process per CPU.
+
+    Args:
+        filenames (list): Paths to the ARFF files, or to folders of ARFF files.
+        output_folder (str): Path to the output folder.
+        output_formats (list): The desired output file formats.
+        fast (bool): Enable fast mode.
+        compression (str): Parquet/ORC compression codec; see build_output.
+    """
+    filenames = expand_inputs(filenames)
+    if not filenames:
+        log_error(0, FILE_ERROR, "No .arff files found in the given folder(s).")
+        exit_with_errors()
+
+    # A file listed twice (e.g. by a shell glob and by name) is validated
+    # and converted once; order is kept.
+    filenames = list(dict.fromkeys(os.path.normpath(filename) for filename in filenames))
+    output_formats = list(dict.fromkeys(output_formats))
+
+    if len(filenames) == 1:
+        process(filenames[0], output_folder, output_formats, fast, compression)
+    else:
+        workers = min(len(filenames), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process, filename, output_folder, output_formats, fast, compression)
+                       for filename in filenames]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except BaseException:
+                # Stop at the first failure: files not yet started are
+                # cancelled, so leaving the block only waits for those
+                # already running. (cancel_futures needs Python 3.9.)
+                for pending in futures:
+                    pending.cancel()
+                raise
+
+    # Once per run, after every worker has reported.
+    greet()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert ARFF files to different formats.",
         epilog=bottom_msg,
         formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument(
-        "--file", "-f", help="Path to the ARFF file.", type=str, required=True)
+        "--file", "-f", help="Path to the ARFF file(s), or folder(s) of ARFF files.", type=str, nargs="+", required=True)
     parser.add_argument(
         "--output", "-o", help="Path to the output folder.", type=str, required=True)
     parser.add_argument(
-        "--format", "-fmt", help="Output format: 'xml', 'json', 'csv', 'xlsx', 'orc', 'parquet'.",
-        choices=["xml", "json", "csv", "xlsx", "orc", "parquet"],
-        type=str, required=True)
+        "--format", "-fmt", help="Output format(s): 'xml', 'json', 'csv', 'xlsx', 'orc', 'parquet', 'arrow', 'feather'.",
+        choices=sorted(legal_formats),
+        type=str.casefold, nargs="+", required=True)
+    parser.add_argument(
+        "--fast", default=False, action="store_true", help="Enable fast mode for faster conversion.")
     parser.add_argument(
-        "--fast", "-f", type=bool, default=False, action="store_true", help="Enable fast mode for faster conversion.")
+        "--compression", "-c", help="Compression codec for parquet and orc output (default: zstd, or snappy with --fast).",
+        choices=["zstd", "snappy", "lz4", "none"], type=str, default=None)
     parser.add_argument(
         "--version", "-v", action="version", version=__version__)
 
     args = parser.parse_args()
 
-    process(args.file, args.output, args.format, args.fast)
+    process_files(args.file, args.output, args.format,
+                  args.fast, args.compression)
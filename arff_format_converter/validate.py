@@ -2,21 +2,38 @@ from .logs import *
 import os
 
 
-def validate_file_path(path: str):
-    if not os.path.isfile(path):
-        log_error(
-            0, FILE_ERROR, "Invalid file path. Please provide a valid path to the ARFF file.")
+def validate_file_path(path):
+    # Only the suffix is checked here. Whether the file exists and can be
+    # read is left to the reader's open() call (see reader.load_arff),
+    # which would fail anyway, so no stat is spent on it up front.
+    if os.fsdecode(path)[-5:].casefold() != ".arff":
+        log_error(0, FILE_ERROR, path)
         exit_with_errors()
 
 
+def validate_input_dir(path: str):
+    # DirEntry.is_file answers from the directory listing itself, so a
+    # folder of N files costs one readdir rather than N stat calls.
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name[-5:].casefold() == ".arff" and entry.is_file():
+                yield entry.path
+
+
 def validate_output_folder(path: str):
-    if not os.path.isdir(path):
+    # EAFP: makedirs creates the folder or accepts an existing one in a
+    # single call; exist_ok also covers another worker process creating
+    # it first. A path that exists but is not a folder raises.
+    try:
+        os.makedirs(path, exist_ok=True)
+    except (OSError, ValueError):
         log_error(
             0, FILE_ERROR, "Invalid output folder path. Please provide a valid path to the output folder.")
         exit_with_errors()
 
 
 def validate_output_format(output_format: str):
+    # Callers pass formats already case-folded (see utils.main and utils.write).
     if output_format not in legal_formats:
         log_error(0, OPTION_ERROR,
                   "Invalid output format. Please provide a valid output format.")
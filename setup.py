@@ -1,8 +1,10 @@
+from pathlib import Path
+
 from setuptools import setup, find_packages
 
 version = '1.1.1'
 name = 'arff-format-converter'
-description = 'Converts ARFF files to CSV, JSON, XML, XLSX, ORC, and parquet.'
+description = 'Converts ARFF files to CSV, JSON, XML, XLSX, ORC, parquet and Arrow/Feather.'
 author = 'Shani Sinojiya'
 author_email = 'shanisinojiya@gmail.com'
 
@@ -23,7 +25,7 @@ keywords = [
     "excel",
     "orc",
     "parquet",
-    "pandas",
+    "feather",
     "pyarrow",
     "data-manipulation",
     "data-export",
@@ -31,40 +33,42 @@ keywords = [
 ]
 
 try:
-    with open("README.md", "r", encoding="utf-8") as fh:
-        long_description = fh.read()
-        setup(
-            name=name,
-            version=version,
-            packages=find_packages(),
-            description=description,
-            author=author,
-            author_email=author_email,
-            maintainer=author,
-            maintainer_email=author_email,
-            license="CC BY-ND 4.0",
-            long_description=long_description,
-            long_description_content_type='text/markdown',
-            install_requires=[
-                "argparse",
-                "pandas",
-                "pyarrow",
-                "scipy"
-            ],
-            entry_points={
-                'console_scripts': [
-                    'arff-format-converter=arff_format_converter.arff_converter:main',
-                ],
-            },
-            keywords=keywords,
-            classifiers=[
-                'Programming Language :: Python :: 3',
-                'Operating System :: OS Independent',
-                'Intended Audience :: Developers',
-                'Intended Audience :: Science/Research',
-                'Programming Language :: Python :: 3 :: Only',
-                'Natural Language :: English',
-            ],
-        )
+    long_description = Path(__file__).with_name("README.md").read_text(encoding="utf-8")
 except FileNotFoundError:
+    # An sdist without the README still builds, with a short description.
     print("Error: Readme File is not Found.")
+    long_description = description
+
+setup(
+    name=name,
+    version=version,
+    packages=find_packages(),
+    description=description,
+    author=author,
+    author_email=author_email,
+    maintainer=author,
+    maintainer_email=author_email,
+    license="CC BY-ND 4.0",
+    long_description=long_description,
+    long_description_content_type='text/markdown',
+    install_requires=[
+        "numpy>=1.21",
+        "pyarrow",
+        "orjson",
+        "xlsxwriter"
+    ],
+    entry_points={
+        'console_scripts': [
+            'arff-format-converter=arff_format_converter.arff_converter:main',
+        ],
+    },
+    keywords=keywords,
+    classifiers=[
+        'Programming Language :: Python :: 3',
+        'Operating System :: OS Independent',
+        'Intended Audience :: Developers',
+        'Intended Audience :: Science/Research',
+        'Programming Language :: Python :: 3 :: Only',
+        'Natural Language :: English',
+    ],
+)
@@ -0,0 +1,117 @@
+import pyarrow as pa
+import pyarrow.csv as pv
+import pytest
+
+from arff_format_converter import reader
+from arff_format_converter.reader import ArffStreamError, load_arff, stream_arff
+from arff_format_converter.utils import process
+
+HEADER = """@relation test
+@attribute a numeric
+@attribute b {'x y',z,x}
+@attribute c string
+@data
+"""
+
+
+def write_arff(tmp_path, text, encoding="utf-8", newline="\n"):
+    path = tmp_path / "data.arff"
+    path.write_bytes(text.replace("\n", newline).encode(encoding))
+    return str(path)
+
+
+def rows(table):
+    return table.to_pylist()
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Makes the CSV reader split even small files into several blocks.
+    monkeypatch.setattr(reader, "CSV_BLOCK_SIZE", 1 << 10)
+
+
+def test_arrow_path_types_and_missing(tmp_path):
+    path = write_arff(tmp_path, HEADER + "1,z,hello\n2.5,?,'quoted text'\n?,x,?\n")
+    table = load_arff(path)
+    assert table.schema.field("a").type == pa.float64()
+    assert pa.types.is_dictionary(table.schema.field("b").type)
+    assert rows(table) == [{"a": 1.0, "b": "z", "c": "hello"},
+                           {"a": 2.5, "b": None, "c": "quoted text"},
+                           {"a": None, "b": "x", "c": None}]
+
+
+def test_padded_values(tmp_path):
+    path = write_arff(tmp_path, HEADER + "1, 'x y', a\n3, ?, ?\n1, x ,b\n")
+    assert rows(load_arff(path)) == [{"a": 1.0, "b": "x y", "c": "a"},
+                                     {"a": 3.0, "b": None, "c": None},
+                                     {"a": 1.0, "b": "x", "c": "b"}]
+
+
+def test_quoted_commas(tmp_path):
+    path = write_arff(tmp_path, HEADER + "1,z,'a, b'\n2, z, 'c, d'\n")
+    assert [row["c"] for row in rows(load_arff(path))] == ["a, b", "c, d"]
+
+
+def test_comment_lines_in_data(tmp_path):
+    path = write_arff(tmp_path, HEADER + "1,z,a\n% a comment\n\n2,x,b\n")
+    assert [row["a"] for row in rows(load_arff(path))] == [1.0, 2.0]
+
+
+def test_comment_lines_in_numeric_data(tmp_path):
+    text = "@relation n\n@attribute a numeric\n@attribute b integer\n@data\n1,2\n% comment\n3,4\n"
+    table = load_arff(write_arff(tmp_path, text))
+    assert table.schema.field("b").type == pa.int64()
+    assert rows(table) == [{"a": 1.0, "b": 2}, {"a": 3.0, "b": 4}]
+
+
+def test_numeric_extra_column_is_an_error(tmp_path):
+    text = "@relation n\n@attribute a numeric\n@attribute b numeric\n@data\n1,2,3\n4,5,6\n"
+    with pytest.raises(SystemExit):
+        load_arff(write_arff(tmp_path, text))
+
+
+def test_latin1(tmp_path):
+    path = write_arff(tmp_path, HEADER + "1,z,café\n", encoding="latin-1")
+    assert rows(load_arff(path))[0]["c"] == "café"
+
+
+def test_crlf(tmp_path):
+    path = write_arff(tmp_path, HEADER + "1,z,a\n2,x,b\n", newline="\r\n")
+    assert rows(load_arff(path)) == [{"a": 1.0, "b": "z", "c": "a"},
+                                     {"a": 2.0, "b": "x", "c": "b"}]
+
+
+def test_empty_data_section(tmp_path):
+    table = load_arff(write_arff(tmp_path, HEADER))
+    assert table.num_rows == 0
+    assert table.column_names == ["a", "b", "c"]
+
+
+def test_missing_data_section(tmp_path):
+    with pytest.raises(SystemExit):
+        load_arff(write_arff(tmp_path, "@relation r\n@attribute a numeric\n"))
+
+
+def test_stream_matches_load(tmp_path, small_blocks):
+    text = HEADER + "".join(f"{i},z,row {i}\n" for i in range(1000))
+    path = write_arff(tmp_path, text)
+    streamed = stream_arff(path)
+    assert isinstance(streamed, pa.RecordBatchReader)
+    assert rows(streamed.read_all()) == rows(load_arff(path))
+
+
+@pytest.mark.parametrize("last_row", ["1,z,a,extra\n", "1, 'x y', a\n"])
+def test_stream_bad_late_block(tmp_path, small_blocks, last_row):
+    text = HEADER + "".join(f"{i},z,row {i}\n" for i in range(1000)) + last_row
+    streamed = stream_arff(write_arff(tmp_path, text))
+    with pytest.raises(ArffStreamError):
+        streamed.read_all()
+
+
+def test_process_retries_late_block_with_full_load(tmp_path, small_blocks):
+    text = HEADER + "".join(f"{i},z,row {i}\n" for i in range(1000)) + "% late comment\n1000,x,last\n"
+    output = tmp_path / "out"
+    process(write_arff(tmp_path, text), str(output), ["csv"])
+    written, = output.iterdir()
+    assert written.suffix == ".csv"
+    assert pv.read_csv(written).num_rows == 1001